@@ -4,8 +4,10 @@ Openfiles Async Python SDK
 Una versión asíncrona del SDK de Python para interactuar con la API de Openfiles.
 """
 
+from typing import TYPE_CHECKING, Any
+
 from .client import AsyncOpenfilesClient
-from .models import BagResponse, FileInfoResponse, UserResponse, ValidationError, HTTPValidationError
+from .models import _ERROR_MODELS, BagResponse, FileInfoResponse, UserResponse
 from .exceptions import (
     OpenfilesError,
     OpenfilesValidationError,
@@ -13,7 +15,20 @@ from .exceptions import (
     OpenfilesHTTPError,
 )
 
-__version__ = "1.2.0"
+if TYPE_CHECKING:
+    from .models import ValidationError, HTTPValidationError
+
+
+def __getattr__(name: str) -> Any:
+    # Los modelos de error (pydantic) se importan solo cuando se usan
+    if name in _ERROR_MODELS:
+        from . import models
+
+        return getattr(models, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__version__ = "1.3.0"
 __all__ = [
     "AsyncOpenfilesClient",
     "BagResponse",
@@ -0,0 +1,20 @@
+"""
+Modelos de error de validación de la API de Openfiles.
+"""
+
+from typing import List, Optional, Union
+from pydantic import BaseModel, Field
+
+
+class ValidationError(BaseModel):
+    """Modelo de error de validación."""
+
+    loc: List[Union[str, int]] = Field(..., title="Location")
+    msg: str = Field(..., title="Message")
+    type: str = Field(..., title="Error Type")
+
+
+class HTTPValidationError(BaseModel):
+    """Modelo de error de validación HTTP."""
+
+    detail: Optional[List[ValidationError]] = Field(None, title="Detail")
@@ -3,14 +3,50 @@ Cliente Asíncrono de la API de Openfiles
 """
 
 import os
+import random
+import struct
+import sys
 import aiohttp
-import aiofiles
 import asyncio
-from typing import List, Optional, Dict, Any, Union
+from collections import deque
+from contextlib import asynccontextmanager
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    BinaryIO,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    TYPE_CHECKING,
+    TypeVar,
+    Union,
+)
 from pathlib import Path
-import tempfile
-import zipfile
+import time
+import zlib
 import re
+from urllib.parse import unquote
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson es opcional (extra "fast")
+    from json import loads as _json_loads
+
+try:
+    from msgspec.json import decode as _msgspec_decode
+except ImportError:  # msgspec es opcional (extra "fast")
+    _msgspec_decode = None
 
 from .exceptions import (
     OpenfilesAPIError,
@@ -18,7 +54,341 @@ from .exceptions import (
     OpenfilesValidationError,
 )
 
-from .models import BagResponse, FileInfoResponse, UserResponse, HTTPValidationError
+from .models import BagResponse, FileInfoResponse, UserResponse
+
+# zipfile e isal solo se usan al subir carpetas, y pydantic solo para los errores
+# de validación, así que se importan al usarlos para no alargar el import del SDK
+if TYPE_CHECKING:
+    import zipfile
+
+# Mismo valor que zipfile.ZIP_DEFLATED, para los valores por defecto
+_ZIP_DEFLATED = 8
+
+T = TypeVar("T")
+
+# Tamaño de bloque para leer y escribir archivos en streaming
+_IO_BUFFER_SIZE = 1 << 17  # 128 KiB
+
+# Nombre de archivo en Content-Disposition, tanto ``filename=`` como ``filename*=`` (RFC 5987)
+# El valor puede ser un string entre comillas (con escapes ``\"``) o un token sin comillas
+_FILENAME_RE = re.compile(
+    r'filename(\*?)\s*=\s*(?:"((?:[^"\\]|\\.)*)"|([^;\s]+))', re.IGNORECASE
+)
+_QUOTED_PAIR_RE = re.compile(r"\\(.)")
+
+# Reintentos ante fallos transitorios: solo para métodos idempotentes
+_MAX_ATTEMPTS = 3
+_RETRY_STATUSES = frozenset({502, 503, 504})
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+# Extensiones de archivos ya comprimidos: se guardan sin comprimir (ZIP_STORED)
+# porque volver a comprimirlos gasta CPU sin reducir el tamaño
+_PRECOMPRESSED_SUFFIXES = frozenset(
+    {
+        ".jpg", ".jpeg", ".png", ".gif", ".webp",
+        ".mp3", ".mp4", ".mkv", ".mov", ".avi", ".webm",
+        ".zip", ".gz", ".tgz", ".bz2", ".xz", ".7z", ".rar", ".zst",
+    }
+)
+
+# Los archivos hasta este tamaño se comprimen en paralelo en memoria; los más
+# grandes se escriben en streaming con zipfile para no cargarlos enteros
+_PARALLEL_ZIP_MAX_FILE_SIZE = 4 << 20  # 4 MiB
+
+# Las conexiones TLS cerradas a medias solo se filtran antes de Python 3.12.8 y en
+# 3.13.0 (cpython#118960); en el resto aiohttp ignora enable_cleanup_closed y avisa
+_NEEDS_CLEANUP_CLOSED = sys.version_info < (3, 12, 8) or (3, 13, 0) <= sys.version_info < (3, 13, 1)
+
+# Flag de la cabecera local y firma del data descriptor que la sigue (APPNOTE 4.3.9)
+_ZIP_FLAG_DATA_DESCRIPTOR = 0x08
+_ZIP_DATA_DESCRIPTOR_SIGNATURE = 0x08074B50
+
+
+def _decode_models(raw: bytes, model: Type[Any], many: bool = False) -> Any:
+    """
+    Decodificar una respuesta JSON directamente en modelos de respuesta.
+
+    Con msgspec instalado el JSON se decodifica y los modelos se construyen en una
+    sola pasada en C; si no, se parsea el JSON y se usa ``from_dict``, que convierte
+    los campos con las mismas reglas y también lanza ``ValueError`` si no encajan.
+
+    Args:
+        raw: Cuerpo de la respuesta
+        model: Clase del modelo de respuesta
+        many: Si la respuesta es una lista de modelos
+
+    Returns:
+        Un modelo o una lista de modelos
+    """
+    if _msgspec_decode is not None:
+        return _msgspec_decode(raw, type=List[model] if many else model, strict=False)
+
+    data = _json_loads(raw)
+    if many:
+        return [model.from_dict(item) for item in data]
+    return model.from_dict(data)
+
+
+def _env_int(name: str, default: int) -> int:
+    """Leer un entero positivo de una variable de entorno."""
+    value = os.environ.get(name)
+    if not value:
+        return default
+    try:
+        return max(1, int(value))
+    except ValueError:
+        raise ValueError(f"La variable de entorno {name} debe ser un entero: {value!r}")
+
+
+@lru_cache(maxsize=None)
+def _load_isal_zlib() -> Any:
+    """Importar ``isal.isal_zlib`` la primera vez que se necesita, o None si no está."""
+    try:
+        from isal import isal_zlib
+    except ImportError:  # isal es opcional (extra "fast")
+        return None
+    return isal_zlib
+
+
+def _deflate_module() -> Any:
+    """
+    Elegir la implementación de deflate para comprimir las entradas del zip.
+
+    Si ``isal`` está instalado se usa ISA-L, que comprime varias veces más rápido
+    que zlib, tanto en los archivos que se comprimen en memoria como en los
+    grandes que se comprimen por bloques. Se puede desactivar con OPENFILES_ZIP_ISAL=0.
+    """
+    if os.environ.get("OPENFILES_ZIP_ISAL", "1") != "0":
+        isal_zlib = _load_isal_zlib()
+        if isal_zlib is not None:
+            return isal_zlib
+    return zlib
+
+
+def _deflate_level(deflate: Any, compresslevel: Optional[int]) -> int:
+    """Traducir un nivel de zlib (0-9) al rango de la implementación elegida."""
+    if deflate is zlib:
+        return zlib.Z_DEFAULT_COMPRESSION if compresslevel is None else compresslevel
+    if compresslevel is None or compresslevel < 0:
+        return deflate.ISAL_DEFAULT_COMPRESSION
+    if compresslevel == 0:
+        return 0
+    # ISA-L solo tiene los niveles 0-3, y su nivel 0 comprime bastante menos que el 1
+    # de zlib: 1-3 -> 1, 4-6 -> 2 (el 6 de zlib es el 2 por defecto de ISA-L), 7-9 -> 3
+    return min(deflate.ISAL_BEST_COMPRESSION, (compresslevel + 2) // 3)
+
+
+def _walk_files(folder_path: str) -> Iterator[Tuple[os.DirEntry, str]]:
+    """
+    Recorrer recursivamente los archivos de una carpeta con ``os.scandir``.
+
+    Igual que ``os.walk``, no entra en enlaces simbólicos a directorios.
+
+    Args:
+        folder_path: Ruta de la carpeta a recorrer
+
+    Yields:
+        Tuplas con la entrada del archivo y su ruta relativa a ``folder_path``
+    """
+    prefix_len = len(os.path.join(folder_path, ""))
+    stack = [folder_path]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir():
+                    if not entry.is_symlink():
+                        stack.append(entry.path)
+                else:
+                    yield entry, entry.path[prefix_len:]
+
+
+def _zip_info(arcname: str, st: os.stat_result) -> "zipfile.ZipInfo":
+    """Equivalente a ``ZipInfo.from_file`` sin volver a llamar a stat."""
+    import zipfile
+
+    zinfo = zipfile.ZipInfo(arcname, time.localtime(st.st_mtime)[0:6])
+    zinfo.external_attr = (st.st_mode & 0xFFFF) << 16
+    return zinfo
+
+
+def _deflate_entry(
+    file_path: str, arcname: str, st: os.stat_result, compresslevel: Optional[int]
+) -> Tuple["zipfile.ZipInfo", bytes]:
+    """
+    Leer y comprimir con deflate un archivo para el zip (se ejecuta en un hilo).
+
+    Args:
+        file_path: Ruta del archivo a comprimir
+        arcname: Nombre del archivo dentro del zip
+        st: Resultado de ``stat`` del archivo, ya obtenido durante el recorrido
+        compresslevel: Nivel de compresión de zlib
+
+    Returns:
+        Tupla con el ZipInfo ya completado y los datos comprimidos
+    """
+    import zipfile
+
+    zinfo = _zip_info(arcname, st)
+    with open(file_path, "rb") as f:
+        data = f.read()
+
+    deflate = _deflate_module()
+    compressor = deflate.compressobj(_deflate_level(deflate, compresslevel), deflate.DEFLATED, -15)
+    compressed = compressor.compress(data) + compressor.flush()
+
+    zinfo.compress_type = zipfile.ZIP_DEFLATED
+    zinfo.file_size = len(data)
+    zinfo.compress_size = len(compressed)
+    zinfo.CRC = deflate.crc32(data)
+    return zinfo, compressed
+
+
+def _write_deflated_entry(
+    zipf: "zipfile.ZipFile", zinfo: "zipfile.ZipInfo", compressed: bytes
+) -> None:
+    """
+    Añadir al zip una entrada que ya viene comprimida.
+
+    zipfile no permite escribir datos comprimidos de antemano, así que se escribe
+    la cabecera local y los datos directamente y se registra la entrada para que
+    el directorio central se genere al cerrar el archivo. Solo debe llamarse desde
+    el hilo que escribe el zip.
+    """
+    zipf._writecheck(zinfo)
+    zinfo.header_offset = zipf.fp.tell()
+    zipf.fp.write(zinfo.FileHeader())
+    zipf.fp.write(compressed)
+    zipf.filelist.append(zinfo)
+    zipf.NameToInfo[zinfo.filename] = zinfo
+    zipf.start_dir = zipf.fp.tell()
+    zipf._didModify = True
+
+
+def _write_deflated_stream(
+    zipf: "zipfile.ZipFile",
+    file_path: str,
+    arcname: str,
+    st: os.stat_result,
+    compresslevel: Optional[int],
+    deflate: Any,
+) -> None:
+    """
+    Comprimir un archivo grande por bloques con ``deflate`` y añadirlo al zip.
+
+    ``zipf.write`` siempre comprime con zlib. Para usar ISA-L también con los
+    archivos que no se comprimen en memoria, se escribe la cabecera local con el
+    flag de data descriptor (CRC y tamaños a cero), los datos a medida que se
+    comprimen y, al final, el data descriptor con los valores reales, igual que
+    hace zipfile con destinos que no admiten ``seek``. Solo debe llamarse desde el
+    hilo que escribe el zip.
+    """
+    import zipfile
+
+    zinfo = _zip_info(arcname, st)
+    zinfo.compress_type = zipfile.ZIP_DEFLATED
+    zinfo.flag_bits |= _ZIP_FLAG_DATA_DESCRIPTOR
+    # Mismo criterio que zipfile: el comprimido puede ocupar algo más que el original
+    zip64 = st.st_size * 1.05 > zipfile.ZIP64_LIMIT
+
+    zipf._writecheck(zinfo)
+    fp = zipf.fp
+    zinfo.header_offset = fp.tell()
+    fp.write(zinfo.FileHeader(zip64))
+    zipf._didModify = True
+
+    compressor = deflate.compressobj(_deflate_level(deflate, compresslevel), deflate.DEFLATED, -15)
+    crc = file_size = compress_size = 0
+    with open(file_path, "rb") as f:
+        while True:
+            block = f.read(_IO_BUFFER_SIZE)
+            if not block:
+                break
+            file_size += len(block)
+            crc = deflate.crc32(block, crc)
+            compressed = compressor.compress(block)
+            compress_size += len(compressed)
+            fp.write(compressed)
+    compressed = compressor.flush()
+    compress_size += len(compressed)
+    fp.write(compressed)
+
+    if not zip64 and max(file_size, compress_size) > zipfile.ZIP64_LIMIT:
+        raise RuntimeError(f"{file_path} creció mientras se comprimía y necesita ZIP64")
+
+    zinfo.CRC = crc
+    zinfo.file_size = file_size
+    zinfo.compress_size = compress_size
+    descriptor_format = "<LLQQ" if zip64 else "<LLLL"
+    fp.write(
+        struct.pack(
+            descriptor_format, _ZIP_DATA_DESCRIPTOR_SIGNATURE, crc, compress_size, file_size
+        )
+    )
+    zipf.filelist.append(zinfo)
+    zipf.NameToInfo[zinfo.filename] = zinfo
+    zipf.start_dir = fp.tell()
+
+
+class _ZipStreamAborted(OSError):
+    """La subida terminó antes de que se consumiera todo el zip."""
+
+
+class _ZipStream:
+    """
+    Objeto de archivo de solo escritura que pasa el zip al loop de eventos.
+
+    El zip se escribe desde un hilo con ``write`` y los bytes se agrupan en bloques
+    que se entregan por una cola acotada a ``chunks``, que aiohttp consume para
+    enviar el cuerpo de la petición. Cuando la cola está llena el hilo espera, así
+    que la memoria usada no depende del tamaño del zip.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, maxsize: int = 8):
+        self._loop = loop
+        self._queue: "asyncio.Queue[Union[bytes, BaseException, None]]" = asyncio.Queue(maxsize)
+        self._buffer = bytearray()
+        self._aborted = False
+
+    def _put(self, item: Union[bytes, BaseException, None]) -> None:
+        """Encolar un elemento desde el hilo del zip, esperando si la cola está llena."""
+        if self._aborted:
+            raise _ZipStreamAborted("La subida de la carpeta se interrumpió")
+        asyncio.run_coroutine_threadsafe(self._queue.put(item), self._loop).result()
+
+    def write(self, data: bytes) -> int:
+        self._buffer += data
+        if len(self._buffer) >= _IO_BUFFER_SIZE:
+            self._put(bytes(self._buffer))
+            self._buffer.clear()
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self, error: Optional[BaseException] = None) -> None:
+        """Enviar lo que quede en el buffer y marcar el final (o el error) del zip."""
+        if self._aborted:
+            return
+        if self._buffer and error is None:
+            self._put(bytes(self._buffer))
+            self._buffer.clear()
+        self._put(error)
+
+    def abort(self) -> None:
+        """Interrumpir la escritura desde el loop de eventos y liberar al hilo del zip."""
+        self._aborted = True
+        while not self._queue.empty():
+            self._queue.get_nowait()
+
+    async def chunks(self) -> AsyncIterator[bytes]:
+        """Iterar los bloques del zip a medida que se escriben."""
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
 
 
 class AsyncOpenfilesClient:
@@ -28,7 +398,12 @@ class AsyncOpenfilesClient:
 
     BASE_URL = "https://app.openfiles.xyz"  # URL base por defecto
 
-    def __init__(self, api_token: Optional[str] = None, base_url: Optional[str] = None):
+    def __init__(
+        self,
+        api_token: Optional[str] = None,
+        base_url: Optional[str] = None,
+        warmup: bool = False,
+    ):
         """
         Inicializar el cliente asíncrono de Openfiles.
 
@@ -36,6 +411,7 @@ class AsyncOpenfilesClient:
             api_token: Token de API para autenticación. Si no se proporciona,
                       intentará obtenerlo de la variable de entorno OPENFILES_API_TOKEN.
             base_url: URL base personalizada opcional para la API
+            warmup: Si es True, al entrar en el context manager se llama a ``warmup``
         """
         self.api_token = api_token or os.environ.get("OPENFILES_API_TOKEN")
         if not self.api_token:
@@ -44,11 +420,51 @@ class AsyncOpenfilesClient:
                 "a través de la variable de entorno OPENFILES_API_TOKEN"
             )
         self.base_url = base_url or self.BASE_URL
+        self._warmup_on_enter = warmup
+        self._headers: Dict[str, str] = {"X-Authorization": self.api_token}
         self._session: Optional[aiohttp.ClientSession] = None
+        self._session_lock: Optional[asyncio.Lock] = None
+        # Parámetros del pool de conexiones compartido por todas las peticiones
+        self._connector_kwargs: Dict[str, Any] = dict(
+            limit=64,
+            limit_per_host=32,
+            keepalive_timeout=75,
+            use_dns_cache=True,
+            ttl_dns_cache=300,
+            enable_cleanup_closed=_NEEDS_CLEANUP_CLOSED,
+        )
+        self._timeout = aiohttp.ClientTimeout(total=None, sock_connect=10, sock_read=60)
+
+    @staticmethod
+    def install_uvloop() -> bool:
+        """
+        Usar uvloop como loop de eventos si está instalado.
+
+        uvloop reduce bastante la sobrecarga de asyncio en cargas con muchas
+        peticiones cortas. El SDK no lo activa por su cuenta para no cambiar la
+        política de loop de la aplicación: hay que llamarlo antes de ``asyncio.run``.
+
+        Returns:
+            True si se instaló uvloop, False si no está disponible
+        """
+        try:
+            import uvloop
+        except ImportError:
+            return False
+
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        return True
 
     async def __aenter__(self):
         """Entrada del context manager asíncrono."""
         await self._ensure_session()
+        if self._warmup_on_enter:
+            try:
+                await self.warmup()
+            except BaseException:
+                # __aexit__ no se llama si __aenter__ falla
+                await self.close()
+                raise
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -56,9 +472,39 @@ class AsyncOpenfilesClient:
         await self.close()
 
     async def _ensure_session(self):
-        """Asegurar que la sesión esté inicializada."""
-        if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
+        """
+        Asegurar que la sesión esté inicializada.
+
+        La sesión se reutiliza durante toda la vida del cliente, de modo que las
+        conexiones keep-alive y la caché DNS del conector se comparten entre peticiones.
+        """
+        if self._session is not None and not self._session.closed:
+            return
+
+        if self._session_lock is None:
+            self._session_lock = asyncio.Lock()
+
+        async with self._session_lock:
+            if self._session is None or self._session.closed:
+                self._session = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(**self._connector_kwargs),
+                    timeout=self._timeout,
+                    headers=self._get_headers(),
+                )
+
+    async def warmup(self) -> None:
+        """
+        Preparar una conexión con la API antes de la primera operación.
+
+        Resuelve el DNS y abre una conexión keep-alive (incluido el handshake TLS)
+        con una petición HEAD, de modo que la primera llamada real solo pague el
+        tiempo de la petición HTTP. Es útil en scripts que hacen pocas operaciones.
+
+        A diferencia del resto de peticiones, no se reintenta: si la API no
+        responde, el error se propaga en cuanto falla el primer intento.
+        """
+        async with self._request("HEAD", f"{self.base_url}/", retry=False):
+            pass
 
     async def close(self):
         """Cerrar la sesión HTTP."""
@@ -70,78 +516,147 @@ class AsyncOpenfilesClient:
         Obtener las cabeceras para las peticiones de API.
 
         Returns:
-            Dict con cabeceras de autorización
+            Dict con cabeceras de autorización, creado una sola vez en ``__init__``
+        """
+        return self._headers
+
+    @asynccontextmanager
+    async def _request(
+        self, method: str, url: str, data: Any = None, retry: bool = True
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
         """
-        return {"X-Authorization": self.api_token}
+        Realizar una petición a la API reintentando los fallos transitorios.
 
-    async def _handle_response(self, response: aiohttp.ClientResponse) -> Any:
+        Los métodos idempotentes se reintentan hasta ``_MAX_ATTEMPTS`` veces ante
+        errores de conexión, timeouts y respuestas 502/503/504, esperando
+        ``2**intento`` segundos más un margen aleatorio entre intentos. El resto de
+        métodos se envían una sola vez.
+
+        Args:
+            method: Método HTTP
+            url: URL de la petición
+            data: Cuerpo de la petición, o función sin argumentos que lo construye
+                  de nuevo en cada intento
+            retry: Si es False, la petición se envía una sola vez aunque sea idempotente
+
+        Yields:
+            Objeto de respuesta de aiohttp
+        """
+        await self._ensure_session()
+
+        attempts = _MAX_ATTEMPTS if retry and method in _IDEMPOTENT_METHODS else 1
+        for attempt in range(attempts):
+            last_attempt = attempt == attempts - 1
+            body = data() if callable(data) else data
+
+            try:
+                response = await self._session.request(method, url, data=body)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if last_attempt:
+                    raise
+            else:
+                if last_attempt or response.status not in _RETRY_STATUSES:
+                    async with response:
+                        yield response
+                    return
+                # Liberar la conexión antes de reintentar
+                async with response:
+                    pass
+
+            await asyncio.sleep(2**attempt + random.random())
+
+    async def _handle_response(
+        self,
+        response: aiohttp.ClientResponse,
+        model: Optional[Type[Any]] = None,
+        many: bool = False,
+    ) -> Any:
         """
         Manejar la respuesta de la API.
 
         Args:
             response: Objeto de respuesta de aiohttp
+            model: Modelo de respuesta en el que decodificar el JSON, si se conoce
+            many: Si la respuesta es una lista de ``model``
 
         Returns:
-            Datos de respuesta parseados
+            Datos de respuesta parseados, el modelo (o lista de modelos) indicado, o
+            None si la respuesta JSON viene vacía
 
         Raises:
             OpenfilesValidationError: Para errores de validación
             OpenfilesAPIError: Para errores de API con respuesta JSON
             OpenfilesHTTPError: Para otros errores HTTP
         """
+        # El cuerpo se lee una sola vez y se reutiliza en todas las ramas
+        raw = await response.read()
+
         # Verificar si la respuesta indica un error
         if not response.ok:
             try:
-                error_data = await response.json()
-
-                # Si la respuesta contiene estructura de error de validación
-                if "detail" in error_data:
-                    # Verificar si detail es un string (mensaje de error simple)
-                    if isinstance(error_data["detail"], str):
-                        # Mensaje de error simple
-                        raise OpenfilesAPIError(response.status, error_data)
-                    # Caso contrario, intentar parsear como error de validación (lista de errores)
-                    try:
-                        validation_error = HTTPValidationError(**error_data)
-                        raise OpenfilesValidationError(validation_error)
-                    except Exception:
-                        # Si el parseo del error de validación falla, usar error genérico de API
-                        raise OpenfilesAPIError(response.status, error_data)
-
-                # Otras respuestas de error JSON
-                raise OpenfilesAPIError(response.status, error_data)
-
-            except (ValueError, TypeError):
-                # Si no es JSON o no coincide con nuestro modelo de error
-                text = await response.text()
-                raise OpenfilesHTTPError(response.status, text)
+                error_data = _json_loads(raw)
+            except ValueError:
+                # Si no es JSON, devolver el texto tal cual
+                raise OpenfilesHTTPError(
+                    response.status, raw.decode(response.get_encoding(), "replace")
+                )
+
+            # Si detail no es un string (mensaje de error simple), intentar parsearlo
+            # como error de validación (lista de errores)
+            detail = error_data.get("detail") if isinstance(error_data, dict) else None
+            if detail is not None and not isinstance(detail, str):
+                from .models import HTTPValidationError
+
+                try:
+                    validation_error = HTTPValidationError(**error_data)
+                except Exception:
+                    # Si el parseo del error de validación falla, usar error genérico de API
+                    validation_error = None
+                if validation_error is not None:
+                    raise OpenfilesValidationError(validation_error)
+
+            raise OpenfilesAPIError(response.status, error_data)
 
         # Si llegamos aquí, la respuesta fue exitosa
+        if model is not None:
+            return _decode_models(raw, model, many)
+
         content_type = response.headers.get("Content-Type", "")
         if "application/json" in content_type:
-            return await response.json()
+            # Algunos endpoints responden 200 sin cuerpo aunque declaren JSON
+            if not raw.strip():
+                return None
+            return _json_loads(raw)
 
-        return await response.read()
+        return raw
 
-    def _format_validation_errors(self, validation_error: HTTPValidationError) -> str:
+    async def _gather_limited(
+        self, func: Callable[..., Awaitable[T]], items: Iterable[Any], max_concurrency: int
+    ) -> List[Union[T, BaseException]]:
         """
-        Formatear errores de validación para mejor legibilidad.
+        Ejecutar ``func`` para cada elemento con un límite de operaciones simultáneas.
+
+        Todas las operaciones comparten la sesión y su pool de conexiones.
 
         Args:
-            validation_error: El objeto HTTPValidationError
+            func: Corrutina a ejecutar para cada elemento
+            items: Elementos a procesar
+            max_concurrency: Número máximo de operaciones en curso a la vez
 
         Returns:
-            Un string formateado con errores de validación
+            Lista con el resultado o la excepción de cada elemento, en el mismo orden
         """
-        if not validation_error.detail:
-            return "Error de validación desconocido"
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency debe ser mayor o igual a 1")
+
+        await self._ensure_session()
+        semaphore = asyncio.Semaphore(max_concurrency)
 
-        errors = []
-        for error in validation_error.detail:
-            location = " -> ".join(str(loc) for loc in error.loc)
-            errors.append(f"{location}: {error.msg} ({error.type})")
+        async def _run(item: Any) -> T:
+            async with semaphore:
+                return await func(item)
 
-        return "\n".join(errors)
+        return await asyncio.gather(*[_run(item) for item in items], return_exceptions=True)
 
     async def upload_file(self, file_path: Union[str, Path], description: str) -> BagResponse:
         """
@@ -154,89 +669,194 @@ class AsyncOpenfilesClient:
         Returns:
             BagResponse con el bag_id
         """
-        await self._ensure_session()
-        
         file_path = Path(file_path)
         if not file_path.exists():
             raise FileNotFoundError(f"Archivo no encontrado: {file_path}")
 
         url = f"{self.base_url}/api/files/upload"
 
-        async with aiofiles.open(file_path, "rb") as file:
-            file_content = await file.read()
-            
+        # aiohttp lee el archivo por bloques mientras lo envía, sin cargarlo entero en memoria
+        with open(file_path, "rb", buffering=_IO_BUFFER_SIZE) as file:
             data = aiohttp.FormData()
-            data.add_field("file", file_content, filename=file_path.name)
+            data.add_field(
+                "file", file, filename=file_path.name, content_type="application/octet-stream"
+            )
             data.add_field("description", description)
 
-            async with self._session.post(
-                url, headers=self._get_headers(), data=data
-            ) as response:
-                response_data = await self._handle_response(response)
-                return BagResponse(**response_data)
+            async with self._request("POST", url, data=data) as response:
+                return await self._handle_response(response, BagResponse)
+
+    async def upload_files(
+        self,
+        file_paths: Iterable[Union[str, Path]],
+        description: str,
+        max_concurrency: int = 8,
+    ) -> List[Union[BagResponse, BaseException]]:
+        """
+        Subir varios archivos al almacenamiento TON de forma concurrente.
+
+        Las subidas suelen estar limitadas por la latencia, así que hacer varias a la
+        vez acelera el total. Conviene ajustar ``max_concurrency`` midiendo: valores
+        demasiado altos solo aumentan la memoria y la carga sobre el servidor.
+
+        Args:
+            file_paths: Rutas a los archivos a subir
+            description: Descripción común para todos los archivos
+            max_concurrency: Número máximo de subidas simultáneas
+
+        Returns:
+            Lista con un BagResponse o la excepción producida por cada archivo,
+            en el mismo orden que ``file_paths``
+        """
+        return await self._gather_limited(
+            lambda path: self.upload_file(path, description), file_paths, max_concurrency
+        )
 
     async def upload_folder(
-        self, folder_path: Union[str, Path], description: str
+        self,
+        folder_path: Union[str, Path],
+        description: str,
+        compression: int = _ZIP_DEFLATED,
+        compresslevel: Optional[int] = 1,
     ) -> BagResponse:
         """
         Subir una carpeta al almacenamiento TON.
 
+        La carpeta se empaqueta en un zip antes de subirla. Por defecto se usa
+        ZIP_DEFLATED con nivel 1: comprimir al nivel por defecto de zlib (6) o
+        superior tarda bastante más y apenas reduce el tamaño final. Con
+        ``compression=zipfile.ZIP_STORED`` no se comprime nada y el empaquetado
+        queda limitado por la velocidad del disco. Con el extra ``fast`` (``isal``)
+        las entradas ZIP_DEFLATED se comprimen con ISA-L en lugar de zlib.
+
         Args:
             folder_path: Ruta a la carpeta a subir
             description: Descripción de la carpeta
+            compression: Método de compresión del zip (constantes de ``zipfile``)
+            compresslevel: Nivel de compresión; None usa el nivel por defecto del método
 
         Returns:
             BagResponse con el bag_id
         """
-        await self._ensure_session()
-        
         folder_path = Path(folder_path)
         if not folder_path.exists() or not folder_path.is_dir():
             raise FileNotFoundError(f"Carpeta no encontrada: {folder_path}")
 
-        # Crear un archivo zip temporal de la carpeta
-        with tempfile.NamedTemporaryFile(suffix=".zip", delete=False) as temp_file:
-            temp_path = temp_file.name
-
-        try:
-            # Crear el archivo zip en un executor para no bloquear el loop de eventos
-            await asyncio.get_event_loop().run_in_executor(
-                None, self._create_zip, folder_path, temp_path
-            )
+        url = f"{self.base_url}/api/folders/upload"
+        loop = asyncio.get_event_loop()
+        stream = _ZipStream(loop)
 
-            url = f"{self.base_url}/api/folders/upload"
+        def build_zip() -> None:
+            try:
+                self._create_zip(folder_path, stream, compression, compresslevel)
+            except BaseException as exc:
+                stream.close(exc)
+                raise
+            stream.close()
+
+        # El zip se genera en un hilo propio y se envía a medida que se escribe, sin
+        # pasar por un archivo temporal; al no conocerse el tamaño se usa
+        # Transfer-Encoding: chunked. No se usa el executor por defecto: el hilo se
+        # bloquea mientras la cola está llena, y la petición necesita ese executor
+        # (p. ej. para resolver DNS) para avanzar y vaciarla.
+        zip_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="openfiles-zip")
+        zip_future = loop.run_in_executor(zip_executor, build_zip)
+        zip_executor.shutdown(wait=False)
 
-            async with aiofiles.open(temp_path, "rb") as file:
-                file_content = await file.read()
-                
-                data = aiohttp.FormData()
-                data.add_field("file", file_content, filename=folder_path.name + ".zip")
-                data.add_field("description", description)
-
-                async with self._session.post(
-                    url, headers=self._get_headers(), data=data
-                ) as response:
-                    response_data = await self._handle_response(response)
-                    return BagResponse(**response_data)
-        finally:
-            # Limpiar el archivo temporal
-            if os.path.exists(temp_path):
-                os.unlink(temp_path)
-
-    def _create_zip(self, folder_path: Path, temp_path: str):
+        data = aiohttp.FormData()
+        data.add_field(
+            "file",
+            stream.chunks(),
+            filename=folder_path.name + ".zip",
+            content_type="application/octet-stream",
+        )
+        data.add_field("description", description)
+
+        async def finish_zip() -> Optional[Exception]:
+            """Desbloquear el hilo del zip si sigue escribiendo y esperar a que termine."""
+            if not zip_future.done():
+                stream.abort()
+            zip_error = (await asyncio.gather(zip_future, return_exceptions=True))[0]
+            if isinstance(zip_error, Exception) and not isinstance(zip_error, _ZipStreamAborted):
+                return zip_error
+            return None
+
+        # El hilo se libera también si la petición termina bien: el servidor puede
+        # responder sin leer todo el cuerpo y entonces nadie consume ``chunks``
+        try:
+            async with self._request("POST", url, data=data) as response:
+                bag = await self._handle_response(response, BagResponse)
+        except BaseException as exc:
+            # Si el fallo vino del propio zip, ese es el error relevante
+            zip_error = await finish_zip()
+            if zip_error is not None and isinstance(exc, Exception):
+                raise zip_error
+            raise
+
+        zip_error = await finish_zip()
+        if zip_error is not None:
+            raise zip_error
+        return bag
+
+    def _create_zip(
+        self,
+        folder_path: Path,
+        destination: Union[str, BinaryIO],
+        compression: int = _ZIP_DEFLATED,
+        compresslevel: Optional[int] = 1,
+    ) -> None:
         """
         Crear un archivo zip de manera síncrona (para ejecutar en executor).
-        
+
+        Los archivos con extensiones ya comprimidas (imágenes, vídeo, archivos
+        comprimidos) se guardan siempre con ZIP_STORED.
+
+        Con ZIP_DEFLATED, los archivos pequeños se leen y comprimen en paralelo en
+        un pool de hilos y este hilo solo escribe los resultados en el zip, y los
+        grandes se comprimen por bloques en este hilo; en ambos casos con ISA-L si
+        está instalado (ver ``_deflate_module``). El número
+        de hilos se configura con OPENFILES_ZIP_MAX_WORKERS (por defecto, el número
+        de CPUs) y el máximo de archivos comprimidos pendientes de escribir con
+        OPENFILES_ZIP_CHUNK_BATCH (por defecto 64), que acota la memoria usada.
+
         Args:
             folder_path: Ruta de la carpeta a comprimir
-            temp_path: Ruta del archivo temporal zip
+            destination: Ruta u objeto de archivo donde escribir el zip; no es
+                        necesario que admita ``seek``
+            compression: Método de compresión del zip
+            compresslevel: Nivel de compresión
         """
-        with zipfile.ZipFile(temp_path, "w", zipfile.ZIP_DEFLATED) as zipf:
-            for root, _, files in os.walk(folder_path):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    arcname = os.path.relpath(file_path, folder_path)
-                    zipf.write(file_path, arcname)
+        import zipfile
+
+        parallel = compression == zipfile.ZIP_DEFLATED
+        deflate = _deflate_module() if parallel else zlib
+        max_workers = _env_int("OPENFILES_ZIP_MAX_WORKERS", os.cpu_count() or 1)
+        chunk_batch = _env_int("OPENFILES_ZIP_CHUNK_BATCH", 64)
+
+        with zipfile.ZipFile(
+            destination, "w", compression=compression, compresslevel=compresslevel
+        ) as zipf, ThreadPoolExecutor(max_workers=max_workers) as pool:
+            pending: Deque[Future[Tuple[zipfile.ZipInfo, bytes]]] = deque()
+
+            for entry, arcname in _walk_files(os.fspath(folder_path)):
+                if os.path.splitext(entry.name)[1].lower() in _PRECOMPRESSED_SUFFIXES:
+                    zipf.write(entry.path, arcname, compress_type=zipfile.ZIP_STORED)
+                    continue
+
+                st = entry.stat()
+                if parallel and st.st_size <= _PARALLEL_ZIP_MAX_FILE_SIZE:
+                    pending.append(
+                        pool.submit(_deflate_entry, entry.path, arcname, st, compresslevel)
+                    )
+                    if len(pending) >= chunk_batch:
+                        _write_deflated_entry(zipf, *pending.popleft().result())
+                elif deflate is not zlib:
+                    _write_deflated_stream(zipf, entry.path, arcname, st, compresslevel, deflate)
+                else:
+                    zipf.write(entry.path, arcname)
+
+            while pending:
+                _write_deflated_entry(zipf, *pending.popleft().result())
 
     async def delete_file(self, bag_id: str) -> None:
         """
@@ -245,21 +865,40 @@ class AsyncOpenfilesClient:
         Args:
             bag_id: ID del bag a eliminar
         """
-        await self._ensure_session()
-        
         url = f"{self.base_url}/api/bag"
 
-        data = aiohttp.FormData()
-        data.add_field("bag_id", bag_id)
+        def data() -> aiohttp.FormData:
+            form = aiohttp.FormData()
+            form.add_field("bag_id", bag_id)
+            return form
 
-        async with self._session.delete(
-            url, headers=self._get_headers(), data=data
-        ) as response:
+        async with self._request("DELETE", url, data=data) as response:
             await self._handle_response(response)
 
+    async def delete_files(
+        self, bag_ids: Iterable[str], max_concurrency: int = 16
+    ) -> List[Optional[BaseException]]:
+        """
+        Eliminar varios archivos del almacenamiento TON de forma concurrente.
+
+        Las eliminaciones son peticiones pequeñas cuyo coste es casi todo latencia,
+        así que se permiten más en curso que en las subidas y descargas: con 1000
+        bags el tiempo pasa de unas 1000 idas y vueltas a unas 1000 / max_concurrency,
+        reutilizando las conexiones keep-alive del pool.
+
+        Args:
+            bag_ids: IDs de los bags a eliminar
+            max_concurrency: Número máximo de eliminaciones simultáneas
+
+        Returns:
+            Lista con None o la excepción producida por cada bag, en el mismo orden
+            que ``bag_ids``
+        """
+        return await self._gather_limited(self.delete_file, bag_ids, max_concurrency)
+
     async def download_file(
         self, bag_id: str, destination: Optional[Union[str, Path]] = None
-    ) -> Union[bytes, str]:
+    ) -> str:
         """
         Descargar un archivo del almacenamiento TON.
 
@@ -273,17 +912,35 @@ class AsyncOpenfilesClient:
         Returns:
             Ruta al archivo guardado (siempre guarda el archivo)
         """
-        await self._ensure_session()
-        
+        return await self._download_file(bag_id, destination)
+
+    async def _download_file(
+        self,
+        bag_id: str,
+        destination: Optional[Union[str, Path]],
+        claimed: Optional[Set[Path]] = None,
+    ) -> str:
+        """
+        Descargar un bag a disco, como ``download_file``.
+
+        Args:
+            bag_id: ID del bag a descargar
+            destination: Igual que en ``download_file``
+            claimed: Rutas ya asignadas a otras descargas del mismo lote. Si la ruta
+                     elegida ya está en el conjunto, se le añade un sufijo " (n)"
+                     antes de la extensión; la ruta final se añade al conjunto.
+
+        Returns:
+            Ruta al archivo guardado
+        """
         url = f"{self.base_url}/api/bag/download/{bag_id}"
 
-        async with self._session.get(
-            url, headers=self._get_headers()
-        ) as response:
-            content = await self._handle_response(response)
+        async with self._request("GET", url) as response:
+            if not response.ok:
+                await self._handle_response(response)
 
-            # Obtener nombre original del archivo
-            original_filename = self._get_filename_from_headers(dict(response.headers))
+            # Obtener nombre original del archivo antes de empezar a escribir
+            original_filename = self._get_filename_from_headers(response.headers)
 
             if destination is None:
                 # Si no se especifica destination, usar nombre original en directorio actual
@@ -295,14 +952,84 @@ class AsyncOpenfilesClient:
                 if destination.is_dir():
                     destination = destination / original_filename
 
-            async with aiofiles.open(destination, "wb") as f:
-                if isinstance(content, bytes):
-                    await f.write(content)
-                else:
-                    await f.write(content.encode())
-
+            if claimed is not None:
+                # Entre la comprobación y el add no hay ningún await, así que dos
+                # descargas del lote nunca reciben la misma ruta
+                candidate, n = destination, 1
+                while candidate in claimed:
+                    candidate = destination.with_name(
+                        f"{destination.stem} ({n}){destination.suffix}"
+                    )
+                    n += 1
+                destination = candidate
+                claimed.add(destination)
+
+            await self._download_streaming(response, destination)
             return str(destination)
 
+    async def _download_streaming(
+        self, response: aiohttp.ClientResponse, destination: Path
+    ) -> None:
+        """
+        Escribir el cuerpo de la respuesta en disco a medida que llega.
+
+        Cada bloque se escribe en un hilo mientras se recibe el siguiente, así que la
+        memoria usada no depende del tamaño del archivo. Si la descarga falla, se
+        elimina el archivo parcial.
+
+        Args:
+            response: Respuesta exitosa de aiohttp
+            destination: Ruta del archivo a escribir
+        """
+        loop = asyncio.get_event_loop()
+        file = await loop.run_in_executor(None, open, destination, "wb")
+        try:
+            async for chunk in response.content.iter_chunked(_IO_BUFFER_SIZE):
+                await loop.run_in_executor(None, file.write, chunk)
+        except BaseException:
+            file.close()
+            destination.unlink()
+            raise
+        else:
+            await loop.run_in_executor(None, file.close)
+
+    async def download_files(
+        self,
+        bag_ids: Iterable[str],
+        destination: Optional[Union[str, Path]] = None,
+        max_concurrency: int = 8,
+    ) -> List[Union[str, BaseException]]:
+        """
+        Descargar varios archivos del almacenamiento TON de forma concurrente.
+
+        Si varios bags tienen el mismo nombre (o ninguno lo indica y se usa
+        ``downloaded_file``), cada uno se guarda en su propio archivo: el primero
+        en empezar a escribirse conserva el nombre y los siguientes se guardan como
+        ``nombre (1).ext``, ``nombre (2).ext``, etc. El orden depende de qué
+        descarga responde antes, así que la ruta de cada bag hay que tomarla de la
+        lista devuelta. Los archivos que ya existían en el directorio antes de la
+        llamada se sobrescriben, igual que en ``download_file``.
+
+        Args:
+            bag_ids: IDs de los bags a descargar
+            destination: Directorio opcional donde guardar los archivos con su nombre
+                        original. Si es None, se usa el directorio actual.
+            max_concurrency: Número máximo de descargas simultáneas
+
+        Returns:
+            Lista con la ruta al archivo guardado o la excepción producida por cada
+            bag, en el mismo orden que ``bag_ids``
+        """
+        if destination is not None and not Path(destination).is_dir():
+            raise NotADirectoryError(f"El destino debe ser un directorio: {destination}")
+
+        claimed: Set[Path] = set()
+        return await self._gather_limited(
+            lambda bag_id: self._download_file(bag_id, destination, claimed),
+            bag_ids,
+            max_concurrency,
+        )
+
     async def download_file_content(self, bag_id: str) -> bytes:
         """
         Descargar contenido de un archivo en memoria (sin guardarlo).
@@ -313,34 +1040,60 @@ class AsyncOpenfilesClient:
         Returns:
             Contenido del archivo como bytes
         """
-        await self._ensure_session()
-        
         url = f"{self.base_url}/api/bag/download/{bag_id}"
 
-        async with self._session.get(
-            url, headers=self._get_headers()
-        ) as response:
-            content = await self._handle_response(response)
-            return content if isinstance(content, bytes) else content.encode()
+        async with self._request("GET", url) as response:
+            if not response.ok:
+                await self._handle_response(response)
+
+            # El contenido se devuelve tal cual, aunque el archivo sea JSON
+            return await response.read()
 
-    def _get_filename_from_headers(self, headers: Dict[str, str]) -> str:
+    def _get_filename_from_headers(self, headers: Mapping[str, str]) -> str:
         """
         Extraer nombre de archivo del header Content-Disposition.
 
+        Si vienen ``filename*=`` y ``filename=``, se prefiere el primero (RFC 6266).
+        El nombre se reduce a su último componente, de modo que un valor como
+        ``../../evil.sh`` no puede llevar la descarga fuera del directorio destino.
+
         Args:
             headers: Headers de respuesta
 
         Returns:
             Nombre de archivo extraído o nombre por defecto
         """
-        content_disposition = headers.get("Content-Disposition", "")
-
-        if "filename=" in content_disposition:
-            filename_match = re.search(r'filename="?([^"]+)"?', content_disposition)
-            if filename_match:
-                return filename_match.group(1)
-
-        return "downloaded_file"
+        content_disposition = headers.get("Content-Disposition")
+        if not content_disposition:
+            return "downloaded_file"
+
+        plain: Optional[str] = None
+        extended: Optional[str] = None
+        for match in _FILENAME_RE.finditer(content_disposition):
+            star, quoted, token = match.groups()
+            value = _QUOTED_PAIR_RE.sub(r"\1", quoted) if quoted is not None else token
+            if star and extended is None:
+                extended = value
+            elif not star and plain is None:
+                plain = value
+
+        filename = plain
+        if extended is not None:
+            # Formato charset'idioma'valor-codificado
+            prefix, _, encoded = extended.rpartition("'")
+            charset = prefix.split("'", 1)[0] or "utf-8"
+            try:
+                filename = unquote(encoded, encoding=charset, errors="replace")
+            except LookupError:
+                # Charset desconocido: usar filename= si lo hay, o leerlo como UTF-8
+                if plain is None:
+                    filename = unquote(encoded, errors="replace")
+
+        # Quitar cualquier ruta, también con separadores de Windows
+        filename = Path((filename or "").replace("\\", "/")).name
+        if filename in ("", ".", ".."):
+            return "downloaded_file"
+        return filename
 
     async def get_user_info(self) -> UserResponse:
         """
@@ -349,15 +1102,10 @@ class AsyncOpenfilesClient:
         Returns:
             UserResponse con información del usuario
         """
-        await self._ensure_session()
-        
         url = f"{self.base_url}/api/user"
 
-        async with self._session.get(
-            url, headers=self._get_headers()
-        ) as response:
-            response_data = await self._handle_response(response)
-            return UserResponse(**response_data)
+        async with self._request("GET", url) as response:
+            return await self._handle_response(response, UserResponse)
 
     async def get_user_files_list(self) -> List[FileInfoResponse]:
         """
@@ -366,15 +1114,10 @@ class AsyncOpenfilesClient:
         Returns:
             Lista de objetos FileInfoResponse
         """
-        await self._ensure_session()
-        
         url = f"{self.base_url}/api/user/files_list"
 
-        async with self._session.get(
-            url, headers=self._get_headers()
-        ) as response:
-            response_data = await self._handle_response(response)
-            return [FileInfoResponse(**item) for item in response_data]
+        async with self._request("GET", url) as response:
+            return await self._handle_response(response, FileInfoResponse, many=True)
 
     async def add_by_bag_id(self, bag_id: str) -> None:
         """
@@ -383,14 +1126,10 @@ class AsyncOpenfilesClient:
         Args:
             bag_id: ID del bag a usar
         """
-        await self._ensure_session()
-        
         url = f"{self.base_url}/api/bag/add_by_id"
 
         data = aiohttp.FormData()
         data.add_field("bag_id", bag_id)
 
-        async with self._session.post(
-            url, headers=self._get_headers(), data=data
-        ) as response:
+        async with self._request("POST", url, data=data) as response:
             await self._handle_response(response)
@@ -1,5 +1,19 @@
-from typing import Any, Dict
-from .models import HTTPValidationError
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from .models import HTTPValidationError, ValidationError
+
+_join_loc = " -> ".join
+
+
+def format_validation_errors(detail: Optional[List["ValidationError"]]) -> str:
+    """Formatear errores de validación para mejor legibilidad."""
+    if not detail:
+        return "Error de validación desconocido"
+
+    return "\n".join(
+        f"{_join_loc(map(str, error.loc))}: {error.msg} ({error.type})" for error in detail
+    )
 
 
 class OpenfilesError(Exception):
@@ -11,23 +25,10 @@ class OpenfilesError(Exception):
 class OpenfilesValidationError(OpenfilesError):
     """Excepción lanzada cuando falla la validación de la API."""
 
-    def __init__(self, validation_error: HTTPValidationError):
+    def __init__(self, validation_error: "HTTPValidationError"):
         self.validation_error = validation_error
         self.details = validation_error.detail
-        message = self._format_message()
-        super().__init__(message)
-
-    def _format_message(self) -> str:
-        """Formatear errores de validación para mejor legibilidad."""
-        if not self.details:
-            return "Error de validación desconocido"
-
-        errors = []
-        for error in self.details:
-            location = " -> ".join(str(loc) for loc in error.loc)
-            errors.append(f"{location}: {error.msg} ({error.type})")
-
-        return "\n".join(errors)
+        super().__init__(format_validation_errors(self.details))
 
 
 class OpenfilesAPIError(OpenfilesError):
@@ -2,33 +2,125 @@
 Modelos de datos para la API de Openfiles.
 """
 
-from typing import List, Optional, Union
-from pydantic import BaseModel, Field
+import json
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, Dict, Mapping, Tuple, Type, TypeVar
 
+if TYPE_CHECKING:
+    from ._error_models import HTTPValidationError, ValidationError
 
-class BagResponse(BaseModel):
-    """Modelo de respuesta para operaciones de bag."""
+R = TypeVar("R", bound="_ResponseModel")
+
+# Los modelos de error usan pydantic, cuyo import es lento; se cargan desde
+# ``_error_models`` la primera vez que se accede a ellos
+_ERROR_MODELS = ("ValidationError", "HTTPValidationError")
+
+
+def __getattr__(name: str) -> Any:
+    if name in _ERROR_MODELS:
+        from . import _error_models
+
+        return getattr(_error_models, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _to_str(value: Any) -> str:
+    if not isinstance(value, str):
+        raise ValueError(f"Se esperaba str, se recibió {type(value).__name__}")
+    return value
+
+
+def _to_int(value: Any) -> int:
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            value = float(value)
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise ValueError(f"Se esperaba int, se recibió {value!r}")
+    return value
+
+
+def _to_float(value: Any) -> float:
+    if isinstance(value, str):
+        return float(value)
+    if not isinstance(value, (int, float)) or isinstance(value, bool):
+        raise ValueError(f"Se esperaba float, se recibió {type(value).__name__}")
+    return float(value)
+
+
+_CONVERTERS: Mapping[Any, Callable[[Any], Any]] = {str: _to_str, int: _to_int, float: _to_float}
 
-    bag_id: str
 
+@lru_cache(maxsize=None)
+def _field_converters(cls: type) -> Tuple[Tuple[str, Callable[[Any], Any]], ...]:
+    """Conversor de cada campo del modelo según su anotación."""
+    return tuple((field.name, _CONVERTERS[field.type]) for field in fields(cls))
 
-class ValidationError(BaseModel):
-    """Modelo de error de validación."""
 
-    loc: List[Union[str, int]] = Field(..., title="Location")
-    msg: str = Field(..., title="Message")
-    type: str = Field(..., title="Error Type")
+class _ResponseModel:
+    """
+    Base de los modelos de respuesta.
 
+    Las respuestas correctas provienen de un servidor de confianza, así que se
+    modelan como dataclasses con ``__slots__`` en lugar de modelos de pydantic: se
+    construyen mucho más rápido y no reservan un ``__dict__`` por instancia.
 
-class HTTPValidationError(BaseModel):
-    """Modelo de error de validación HTTP."""
+    Los campos se convierten igual que al decodificar con msgspec en modo no
+    estricto: los números pueden venir como strings (``"2.5"``), los enteros se
+    pasan a float y los floats sin decimales a int. Un campo que falta o que no se
+    puede convertir lanza ``ValueError`` (``msgspec.ValidationError`` es una
+    subclase), de modo que el resultado no depende de si msgspec está instalado.
 
-    detail: Optional[List[ValidationError]] = Field(None, title="Detail")
+    Hasta la versión 1.2 eran modelos de pydantic; ``dict``, ``json``,
+    ``model_dump`` y ``model_dump_json`` se mantienen por compatibilidad.
+    """
 
+    __slots__: Tuple[str, ...] = ()
 
-class FileInfoResponse(BaseModel):
+    @classmethod
+    def from_dict(cls: Type[R], data: Mapping[str, Any]) -> R:
+        """Crear el modelo a partir del JSON de la API, ignorando campos adicionales."""
+        values = {}
+        for name, convert in _field_converters(cls):
+            try:
+                value = data[name]
+            except KeyError:
+                raise ValueError(f"Falta el campo obligatorio `{name}`") from None
+            values[name] = convert(value)
+        return cls(**values)
+
+    def model_dump(self) -> Dict[str, Any]:
+        """Convertir el modelo en un diccionario con sus campos."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def model_dump_json(self) -> str:
+        """Convertir el modelo en un string JSON."""
+        return json.dumps(self.model_dump())
+
+    # Nombres de pydantic v1
+    dict = model_dump
+    json = model_dump_json
+
+
+@dataclass
+class BagResponse(_ResponseModel):
+    """Modelo de respuesta para operaciones de bag."""
+
+    __slots__ = ("bag_id",)
+
+    bag_id: str
+
+
+@dataclass
+class FileInfoResponse(_ResponseModel):
     """Modelo de respuesta de información de archivo."""
 
+    __slots__ = ("filename", "size", "uploaded_at", "description", "bag_id")
+
     filename: str
     size: int
     uploaded_at: float
@@ -36,9 +128,12 @@ class FileInfoResponse(BaseModel):
     bag_id: str
 
 
-class UserResponse(BaseModel):
+@dataclass
+class UserResponse(_ResponseModel):
     """Modelo de respuesta de información de usuario."""
 
+    __slots__ = ("uid", "space_left", "capacity")
+
     uid: str
     space_left: float
     capacity: float
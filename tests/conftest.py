@@ -0,0 +1,83 @@
+"""
+Fixtures compartidas: un servidor HTTP local que imita la API de Openfiles
+"""
+
+import hashlib
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple
+
+import pytest
+from aiohttp import web
+from multidict import CIMultiDictProxy
+
+
+class FakeOpenfiles:
+    """Servidor de pruebas que guarda en memoria lo que se sube."""
+
+    def __init__(self) -> None:
+        self.bags: Dict[str, Tuple[str, bytes]] = {}
+        self.upload_headers: Dict[str, "CIMultiDictProxy[str]"] = {}
+        # Si es True, las subidas se responden sin leer el cuerpo
+        self.respond_before_reading = False
+        # Respuesta que devuelve /api/user en lugar de la información del usuario
+        self.user_response: Optional[web.Response] = None
+        self.app = web.Application(client_max_size=1 << 30)
+        self.app.router.add_post("/api/files/upload", self._upload)
+        self.app.router.add_post("/api/folders/upload", self._upload)
+        self.app.router.add_get("/api/bag/download/{bag_id}", self._download)
+        self.app.router.add_delete("/api/bag", self._delete)
+        self.app.router.add_get("/api/user", self._user)
+        self.app.router.add_route("*", "/", self._root)
+
+    def add_route(self, method: str, path: str, handler: Callable[..., Any]) -> None:
+        self.app.router.add_route(method, path, handler)
+
+    async def _root(self, request: web.Request) -> web.Response:
+        return web.Response()
+
+    async def _upload(self, request: web.Request) -> web.Response:
+        if self.respond_before_reading:
+            return web.json_response({"bag_id": "early"})
+        reader = await request.multipart()
+        filename, data = "", b""
+        async for part in reader:
+            if part.name == "file":
+                filename = part.filename or ""
+                data = bytes(await part.read())
+        bag_id = hashlib.sha256(data).hexdigest()
+        self.bags[bag_id] = (filename, data)
+        self.upload_headers[bag_id] = request.headers
+        return web.json_response({"bag_id": bag_id})
+
+    async def _user(self, request: web.Request) -> web.Response:
+        if self.user_response is not None:
+            return self.user_response
+        return web.json_response({"uid": "user", "space_left": 1.5, "capacity": 2})
+
+    async def _delete(self, request: web.Request) -> web.Response:
+        form = await request.post()
+        self.bags.pop(str(form["bag_id"]), None)
+        # La API responde sin cuerpo aunque declare JSON
+        return web.Response(content_type="application/json")
+
+    async def _download(self, request: web.Request) -> web.StreamResponse:
+        bag_id = request.match_info["bag_id"]
+        if bag_id not in self.bags:
+            return web.json_response({"detail": "Bag not found"}, status=404)
+        filename, data = self.bags[bag_id]
+        return web.Response(
+            body=data, headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+        )
+
+
+@pytest.fixture
+async def api() -> AsyncIterator[Tuple[FakeOpenfiles, str]]:
+    """Arrancar el servidor y devolverlo junto con su URL base."""
+    server = FakeOpenfiles()
+    runner = web.AppRunner(server.app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+    # Se usa "localhost" y no la IP para que aiohttp tenga que resolver el nombre
+    yield server, f"http://localhost:{port}"
+    await runner.cleanup()
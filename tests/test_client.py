@@ -0,0 +1,117 @@
+"""
+Pruebas del ciclo de vida de AsyncOpenfilesClient
+"""
+
+import socket
+import time
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from openfiles_async import AsyncOpenfilesClient, OpenfilesHTTPError
+
+
+def _unused_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def test_warmup_opens_session(api):
+    _, base_url = api
+    async with AsyncOpenfilesClient(api_token="token", base_url=base_url, warmup=True) as client:
+        assert client._session is not None and not client._session.closed
+    assert client._session.closed
+
+
+async def test_failed_warmup_closes_session_without_retrying():
+    client = AsyncOpenfilesClient(
+        api_token="token", base_url=f"http://127.0.0.1:{_unused_port()}", warmup=True
+    )
+    start = time.monotonic()
+    with pytest.raises(aiohttp.ClientConnectionError):
+        async with client:
+            pass
+    assert time.monotonic() - start < 1
+    assert client._session is not None and client._session.closed
+
+
+async def test_delete_with_empty_json_body(api, tmp_path):
+    server, base_url = api
+    path = tmp_path / "borrar.txt"
+    path.write_text("borrar")
+
+    async with AsyncOpenfilesClient(api_token="token", base_url=base_url) as client:
+        bag = await client.upload_file(path, "archivo")
+        assert await client.delete_files([bag.bag_id, "missing"]) == [None, None]
+
+    assert bag.bag_id not in server.bags
+
+
+@pytest.mark.parametrize(
+    "content_disposition, expected",
+    [
+        (None, "downloaded_file"),
+        ("attachment", "downloaded_file"),
+        ('attachment; filename="plain.txt"', "plain.txt"),
+        ("attachment; filename*=UTF-8''%C3%B1and%C3%BA.txt", "ñandú.txt"),
+        (
+            "attachment; filename=\"plain.txt\"; filename*=UTF-8''%C3%B1and%C3%BA.txt",
+            "ñandú.txt",
+        ),
+        (
+            "attachment; filename*=UTF-8''%C3%B1and%C3%BA.txt; filename=\"plain.txt\"",
+            "ñandú.txt",
+        ),
+        ("attachment; filename*=iso-8859-1'es'%F1and%FA.txt", "ñandú.txt"),
+        (
+            "attachment; filename=\"plain.txt\"; filename*=x-unknown''%C3%B1and%C3%BA.txt",
+            "plain.txt",
+        ),
+        ("attachment; filename*=x-unknown''%C3%B1and%C3%BA.txt", "ñandú.txt"),
+        ('attachment; filename="a; b.txt"', "a; b.txt"),
+        ('attachment; filename="a; b.txt"; size=10', "a; b.txt"),
+        (r'attachment; filename="dice \"hola\".txt"', 'dice "hola".txt'),
+        ("attachment; filename=token.txt; size=10", "token.txt"),
+        ("attachment; filename*=UTF-8''..%2F..%2Fevil.sh", "evil.sh"),
+        ('attachment; filename="../../evil.sh"', "evil.sh"),
+        ('attachment; filename="/etc/passwd"', "passwd"),
+        (r'attachment; filename="..\\..\\evil.bat"', "evil.bat"),
+        ('attachment; filename=""', "downloaded_file"),
+        ('attachment; filename="."', "downloaded_file"),
+        ('attachment; filename=".."', "downloaded_file"),
+        ("attachment; filename*=UTF-8''..%2F..", "downloaded_file"),
+        ("attachment; filename*=UTF-8''dir%2F", "dir"),
+    ],
+)
+def test_filename_from_content_disposition(content_disposition, expected):
+    client = AsyncOpenfilesClient(api_token="token")
+    headers = {} if content_disposition is None else {"Content-Disposition": content_disposition}
+    assert client._get_filename_from_headers(headers) == expected
+
+
+@pytest.mark.parametrize("charset", ["x-bogus", "latin-1"])
+async def test_http_error_with_text_body(api, charset):
+    server, base_url = api
+    server.user_response = web.Response(
+        status=500,
+        body="falló el servidor".encode("latin-1"),
+        headers={"Content-Type": f"text/plain; charset={charset}"},
+    )
+
+    async with AsyncOpenfilesClient(api_token="token", base_url=base_url) as client:
+        with pytest.raises(OpenfilesHTTPError) as exc_info:
+            await client.get_user_info()
+
+    assert exc_info.value.status_code == 500
+    # Con un charset desconocido solo se garantiza la parte ASCII del mensaje
+    assert "servidor" in str(exc_info.value)
+
+
+def test_cleanup_closed_only_where_aiohttp_needs_it():
+    needs_cleanup_closed = getattr(aiohttp.connector, "NEEDS_CLEANUP_CLOSED", None)
+    if needs_cleanup_closed is None:
+        pytest.skip("Esta versión de aiohttp no comprueba la versión de Python")
+    client = AsyncOpenfilesClient(api_token="token")
+    assert client._connector_kwargs["enable_cleanup_closed"] == needs_cleanup_closed
@@ -0,0 +1,55 @@
+"""
+Pruebas de download_file y download_files contra el servidor local
+"""
+
+import os
+from pathlib import Path
+
+from openfiles_async import AsyncOpenfilesClient
+
+
+async def test_download_file_to_directory(api, tmp_path):
+    _, base_url = api
+    source = tmp_path / "datos.bin"
+    payload = os.urandom(1 << 20)
+    source.write_bytes(payload)
+    out = tmp_path / "out"
+    out.mkdir()
+
+    async with AsyncOpenfilesClient(api_token="token", base_url=base_url) as client:
+        bag = await client.upload_file(source, "archivo")
+        path = await client.download_file(bag.bag_id, out)
+
+    assert Path(path) == out / "datos.bin"
+    assert Path(path).read_bytes() == payload
+
+
+async def test_download_files_with_duplicate_names(api, tmp_path):
+    _, base_url = api
+    payloads = [os.urandom(1 << 20) for _ in range(3)]
+    sources = []
+    for n, payload in enumerate(payloads):
+        source = tmp_path / f"src{n}" / "datos.bin"
+        source.parent.mkdir()
+        source.write_bytes(payload)
+        sources.append(source)
+    out = tmp_path / "out"
+    out.mkdir()
+
+    async with AsyncOpenfilesClient(api_token="token", base_url=base_url) as client:
+        bags = await client.upload_files(sources, "archivo")
+        bag_ids = [bag.bag_id for bag in bags] + [bags[0].bag_id, "missing"]
+        paths = await client.download_files(bag_ids, out)
+
+    assert isinstance(paths[-1], Exception)
+    paths = [Path(path) for path in paths[:-1]]
+    assert len(set(paths)) == 4
+    assert sorted(path.name for path in paths) == [
+        "datos (1).bin",
+        "datos (2).bin",
+        "datos (3).bin",
+        "datos.bin",
+    ]
+    for path, payload in zip(paths, payloads + [payloads[0]]):
+        assert path.read_bytes() == payload
+    assert sorted(os.listdir(out)) == sorted(path.name for path in paths)
@@ -0,0 +1,81 @@
+"""
+Pruebas de la decodificación de los modelos de respuesta
+"""
+
+import dataclasses
+import json
+
+import pytest
+
+from openfiles_async import client as client_module
+from openfiles_async.client import _decode_models
+from openfiles_async.models import BagResponse, FileInfoResponse, UserResponse
+
+
+@pytest.fixture(params=["msgspec", "from_dict"])
+def decoder(request, monkeypatch):
+    if request.param == "msgspec":
+        if client_module._msgspec_decode is None:
+            pytest.skip("msgspec no está instalado")
+    else:
+        monkeypatch.setattr(client_module, "_msgspec_decode", None)
+    return _decode_models
+
+
+def test_decode_coerces_numbers(decoder):
+    user = decoder(b'{"uid": "u", "space_left": "2.5", "capacity": 1, "extra": 1}', UserResponse)
+    assert user == UserResponse(uid="u", space_left=2.5, capacity=1.0)
+    assert type(user.capacity) is float
+
+    files = decoder(
+        b'[{"filename": "a", "size": 5.0, "uploaded_at": 1, "description": "",'
+        b' "bag_id": "b"}, {"filename": "c", "size": "7", "uploaded_at": "1.5",'
+        b' "description": "d", "bag_id": "e"}]',
+        FileInfoResponse,
+        many=True,
+    )
+    assert files == [
+        FileInfoResponse(filename="a", size=5, uploaded_at=1.0, description="", bag_id="b"),
+        FileInfoResponse(filename="c", size=7, uploaded_at=1.5, description="d", bag_id="e"),
+    ]
+    assert type(files[0].size) is int
+
+
+@pytest.mark.parametrize(
+    "raw, model",
+    [
+        (b'{"uid": "u", "capacity": 1}', UserResponse),
+        (b'{"uid": "u", "space_left": "mucho", "capacity": 1}', UserResponse),
+        (b'{"uid": "u", "space_left": null, "capacity": 1}', UserResponse),
+        (b'{"uid": "u", "space_left": true, "capacity": 1}', UserResponse),
+        (b'{"bag_id": 5}', BagResponse),
+        (
+            b'{"filename": "a", "size": 5.5, "uploaded_at": 1, "description": "",'
+            b' "bag_id": "b"}',
+            FileInfoResponse,
+        ),
+    ],
+)
+def test_decode_rejects_invalid_fields(decoder, raw, model):
+    with pytest.raises(ValueError):
+        decoder(raw, model)
+
+
+def test_pydantic_compatible_dump():
+    user = UserResponse(uid="u", space_left=1.5, capacity=2.0)
+    expected = {"uid": "u", "space_left": 1.5, "capacity": 2.0}
+
+    assert user.model_dump() == user.dict() == expected
+    assert json.loads(user.model_dump_json()) == json.loads(user.json()) == expected
+    assert dataclasses.asdict(user) == expected
+
+
+def test_error_models_load_lazily_from_package():
+    import openfiles_async
+    from openfiles_async import _error_models, models
+
+    for name in models._ERROR_MODELS:
+        assert getattr(openfiles_async, name) is getattr(_error_models, name)
+        assert getattr(models, name) is getattr(_error_models, name)
+    with pytest.raises(AttributeError):
+        openfiles_async.NotAModel
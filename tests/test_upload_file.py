@@ -0,0 +1,22 @@
+"""
+Pruebas de upload_file contra el servidor local
+"""
+
+import os
+
+from openfiles_async import AsyncOpenfilesClient
+
+
+async def test_upload_file_sends_content_length(api, tmp_path):
+    server, base_url = api
+    path = tmp_path / "datos.bin"
+    payload = os.urandom(3 << 20)
+    path.write_bytes(payload)
+
+    async with AsyncOpenfilesClient(api_token="token", base_url=base_url) as client:
+        bag = await client.upload_file(path, "archivo")
+
+    assert server.bags[bag.bag_id] == ("datos.bin", payload)
+    headers = server.upload_headers[bag.bag_id]
+    assert "Transfer-Encoding" not in headers
+    assert int(headers["Content-Length"]) > len(payload)
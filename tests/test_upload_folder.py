@@ -0,0 +1,78 @@
+"""
+Pruebas de upload_folder contra el servidor local
+"""
+
+import asyncio
+import io
+import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+from openfiles_async import AsyncOpenfilesClient
+
+
+def _make_folder(path, seed):
+    (path / "sub").mkdir(parents=True)
+    # Datos aleatorios en .png (se guardan sin comprimir) para que el zip llene la
+    # cola de _ZipStream antes de que la petición empiece a consumirla
+    for i in range(3):
+        (path / "sub" / f"{seed}-{i}.png").write_bytes(os.urandom(1 << 20))
+    (path / "readme.txt").write_text(f"carpeta {seed}\n" * 100)
+
+
+async def test_upload_folder_roundtrip(api, tmp_path):
+    server, base_url = api
+    folder = tmp_path / "data"
+    _make_folder(folder, "a")
+
+    async with AsyncOpenfilesClient(api_token="token", base_url=base_url) as client:
+        bag = await client.upload_folder(folder, "carpeta")
+
+    filename, data = server.bags[bag.bag_id]
+    assert filename == "data.zip"
+    with zipfile.ZipFile(io.BytesIO(data)) as zipf:
+        assert zipf.testzip() is None
+        assert sorted(zipf.namelist()) == ["readme.txt"] + [f"sub/a-{i}.png" for i in range(3)]
+        assert zipf.read("readme.txt") == (folder / "readme.txt").read_bytes()
+
+
+async def test_concurrent_uploads_exceeding_default_executor(api, tmp_path):
+    # El productor del zip no debe ocupar el executor por defecto: aiohttp lo usa
+    # para resolver DNS, y con todos sus hilos esperando a que se vacíe la cola
+    # ninguna petición podría avanzar
+    server, base_url = api
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=2)
+    loop.set_default_executor(executor)
+    folders = []
+    for n in range(4):
+        folder = tmp_path / f"data{n}"
+        _make_folder(folder, str(n))
+        folders.append(folder)
+
+    async with AsyncOpenfilesClient(api_token="token", base_url=base_url) as client:
+        bags = await asyncio.wait_for(
+            asyncio.gather(*(client.upload_folder(folder, "carpeta") for folder in folders)),
+            timeout=30,
+        )
+
+    assert len({bag.bag_id for bag in bags}) == len(folders)
+    for bag in bags:
+        with zipfile.ZipFile(io.BytesIO(server.bags[bag.bag_id][1])) as zipf:
+            assert zipf.testzip() is None
+
+
+async def test_upload_folder_with_early_response(api, tmp_path):
+    # Si el servidor responde sin leer todo el cuerpo, aiohttp deja de consumir el
+    # zip; el hilo que lo escribe debe liberarse igualmente
+    server, base_url = api
+    server.respond_before_reading = True
+    folder = tmp_path / "data"
+    (folder / "sub").mkdir(parents=True)
+    for i in range(40):
+        (folder / "sub" / f"{i}.png").write_bytes(os.urandom(1 << 20))
+
+    async with AsyncOpenfilesClient(api_token="token", base_url=base_url) as client:
+        bag = await asyncio.wait_for(client.upload_folder(folder, "carpeta"), timeout=30)
+
+    assert bag.bag_id == "early"
@@ -0,0 +1,157 @@
+"""
+Pruebas de la generación del zip de upload_folder
+"""
+
+import io
+import os
+import shutil
+import subprocess
+import zipfile
+import zlib
+
+import pytest
+
+from openfiles_async import AsyncOpenfilesClient
+from openfiles_async.client import (
+    _PARALLEL_ZIP_MAX_FILE_SIZE,
+    _deflate_level,
+    _load_isal_zlib,
+)
+
+
+class _NonSeekableSink:
+    """Destino de solo escritura, sin tell ni seek, como _ZipStream."""
+
+    def __init__(self) -> None:
+        self.data = bytearray()
+
+    def write(self, data: bytes) -> int:
+        self.data += data
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+
+@pytest.fixture
+def folder(tmp_path):
+    root = tmp_path / "carpeta"
+    (root / "sub" / "más").mkdir(parents=True)
+    (root / "pequeño.txt").write_text("hola mundo\n" * 1000, encoding="utf-8")
+    (root / "vacío.txt").write_bytes(b"")
+    (root / "sub" / "imagen.PNG").write_bytes(os.urandom(64 << 10))
+    (root / "sub" / "más" / "ñandú.json").write_text('{"a": 1}\n' * 500, encoding="utf-8")
+    # Más grande que el límite de la compresión en paralelo: va por zipfile.write
+    (root / "sub" / "grande.log").write_bytes(
+        b"".join(b"linea %d\n" % i for i in range((_PARALLEL_ZIP_MAX_FILE_SIZE >> 3) + 100000))
+    )
+    return root
+
+
+def _expected(root):
+    return {
+        path.relative_to(root).as_posix(): path.read_bytes()
+        for path in root.rglob("*")
+        if path.is_file()
+    }
+
+
+def _check_zip(data, root, compress_type=zipfile.ZIP_DEFLATED):
+    expected = _expected(root)
+    with zipfile.ZipFile(io.BytesIO(data)) as zipf:
+        assert zipf.testzip() is None
+        assert sorted(zipf.namelist()) == sorted(expected)
+        for name, content in expected.items():
+            assert zipf.read(name) == content
+        infos = {info.filename: info for info in zipf.infolist()}
+    assert infos["sub/imagen.PNG"].compress_type == zipfile.ZIP_STORED
+    assert infos["sub/grande.log"].file_size > _PARALLEL_ZIP_MAX_FILE_SIZE
+    for name in ("pequeño.txt", "vacío.txt", "sub/más/ñandú.json", "sub/grande.log"):
+        assert infos[name].compress_type == compress_type
+        # Los nombres no ASCII se guardan en UTF-8 y se marcan como tales
+        if not name.isascii():
+            assert infos[name].flag_bits & 0x800
+
+
+def _check_with_unzip(path):
+    if shutil.which("unzip") is None:
+        return
+    result = subprocess.run(["unzip", "-tq", os.fspath(path)], capture_output=True)
+    assert result.returncode == 0, result.stdout + result.stderr
+
+
+@pytest.fixture
+def client():
+    return AsyncOpenfilesClient(api_token="token")
+
+
+@pytest.mark.parametrize("chunk_batch", ["64", "1"])
+def test_create_zip_to_path(client, folder, tmp_path, monkeypatch, chunk_batch):
+    monkeypatch.setenv("OPENFILES_ZIP_CHUNK_BATCH", chunk_batch)
+    destination = tmp_path / "salida.zip"
+
+    client._create_zip(folder, os.fspath(destination))
+
+    _check_zip(destination.read_bytes(), folder)
+    _check_with_unzip(destination)
+
+
+def test_create_zip_to_non_seekable_sink(client, folder, tmp_path):
+    sink = _NonSeekableSink()
+
+    client._create_zip(folder, sink)
+
+    _check_zip(bytes(sink.data), folder)
+    destination = tmp_path / "salida.zip"
+    destination.write_bytes(sink.data)
+    _check_with_unzip(destination)
+
+
+@pytest.mark.parametrize("use_isal", ["1", "0"])
+def test_create_zip_large_entries(client, folder, tmp_path, monkeypatch, use_isal):
+    monkeypatch.setenv("OPENFILES_ZIP_ISAL", use_isal)
+    streamed = use_isal == "1" and _load_isal_zlib() is not None
+    destination = tmp_path / "salida.zip"
+
+    client._create_zip(folder, os.fspath(destination))
+
+    _check_zip(destination.read_bytes(), folder)
+    _check_with_unzip(destination)
+    with zipfile.ZipFile(destination) as zipf:
+        info = zipf.getinfo("sub/grande.log")
+    # Con ISA-L el archivo grande se comprime por bloques y lleva data descriptor
+    assert bool(info.flag_bits & 0x08) == streamed
+
+
+def test_create_zip_stored(client, folder):
+    sink = _NonSeekableSink()
+
+    client._create_zip(folder, sink, compression=zipfile.ZIP_STORED, compresslevel=None)
+
+    _check_zip(bytes(sink.data), folder, compress_type=zipfile.ZIP_STORED)
+
+
+@pytest.mark.parametrize(
+    "compresslevel, expected",
+    [(None, 2), (-1, 2), (0, 0), (1, 1), (2, 1), (3, 1), (4, 2), (6, 2), (7, 3), (9, 3)],
+)
+def test_isal_levels(compresslevel, expected):
+    isal_zlib = _load_isal_zlib()
+    if isal_zlib is None:
+        pytest.skip("isal no está instalado")
+    assert _deflate_level(isal_zlib, compresslevel) == expected
+
+
+def test_isal_default_level_ratio_matches_zlib():
+    isal_zlib = _load_isal_zlib()
+    if isal_zlib is None:
+        pytest.skip("isal no está instalado")
+    data = b"".join(
+        b"2024-01-01 12:00:%02d INFO peticion %d ok\n" % (i % 60, i) for i in range(50000)
+    )
+
+    def deflated_size(deflate):
+        compressor = deflate.compressobj(_deflate_level(deflate, 1), deflate.DEFLATED, -15)
+        return len(compressor.compress(data) + compressor.flush())
+
+    assert deflated_size(isal_zlib) < deflated_size(zlib) * 1.2